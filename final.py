@@ -1,9 +1,12 @@
-import tkinter as tk
-from tkinter import Canvas
+import os
+import queue
+import re
+import sys
 import serial
 from serial.tools import list_ports
 import time
-import threading
+
+from gesture_window import BaseGestureWindow
 
 try:
     import keyboard  # global hotkeys
@@ -12,29 +15,59 @@ except ImportError:
 
 
 BAUD_RATE = 115200
+PORT_CACHE_FILE = os.path.expanduser("~/.gesture_console_port")
+
+# Keys 3/4/5/6 (channel index 2..5) only act after tapping 0 first
+SPECIAL_MASK = 0b111100
+
+# Gesture key -> channel index
+_KEY_IDX = {c: i for i, c in enumerate("1234567")}
+
+# Global-hook queue poll (ms): fast while keys are moving or held, slow when idle
+KB_POLL_ACTIVE_MS = 5
+KB_POLL_IDLE_MS = 30
+
 
+# (VID, PID) of Arduino-style boards and common USB-serial bridges; PID None = any
+ARDUINO_VID_PIDS = frozenset([
+    (0x2341, None),    # Arduino SA
+    (0x2A03, None),    # Arduino.org
+    (0x1B4F, None),    # SparkFun (Pro Micro)
+    (0x1A86, 0x7523),  # CH340
+    (0x0403, 0x6001),  # FTDI FT232R
+])
 
-def find_arduino_port():
+
+def find_arduino_port(verbose=False):
     """
     Try to automatically find an Arduino-like serial device.
-    Prints all candidates for debugging.
+    Matches known VID/PIDs first, then falls back to name heuristics.
+    verbose=True prints all candidates for debugging.
     """
     ports = list_ports.comports()
     if not ports:
         print("No serial ports found.")
         return None
 
-    print("Available serial ports:")
+    if verbose:
+        print("Available serial ports:")
     candidate = None
+    fallback = None
     for p in ports:
-        vid = hex(p.vid) if p.vid else None
-        pid = hex(p.pid) if p.pid else None
-        print(f"  {p.device} | {p.description} | VID={vid} PID={pid}")
+        if verbose:
+            vid = hex(p.vid) if p.vid else None
+            pid = hex(p.pid) if p.pid else None
+            print(f"  {p.device} | {p.description} | VID={vid} PID={pid}")
 
-        # Heuristic: Arduino-ish devices
-        if ("Arduino" in (p.description or "")) or ("usbmodem" in p.device) or ("usbserial" in p.device) or (p.device == "COM3"):
+        if (p.vid, p.pid) in ARDUINO_VID_PIDS or (p.vid, None) in ARDUINO_VID_PIDS:
             candidate = p.device
+            break
+
+        # Heuristic: Arduino-ish device names
+        if ("Arduino" in (p.description or "")) or ("usbmodem" in p.device) or ("usbserial" in p.device) or (p.device == "COM3"):
+            fallback = p.device
 
+    candidate = candidate or fallback
     if candidate:
         print("Using serial port:", candidate)
     else:
@@ -42,42 +75,194 @@ def find_arduino_port():
     return candidate
 
 
-class GesturePPMApp:
+def compute_targets(active, ch3_high, press, idle):
+    """
+    Pure mapping from the active-key bitmask (bit i = key i+1, arming already
+    applied) to the 8-channel frame. Timing for the CH3 pulse stays with the caller.
+    """
+    CH6_LEFT = 735    # 0 -> 5
+
+    # CH6 driven by keys 5/6 (both require arm); 6 wins over 5
+    if active & 0b100000:
+        ch6 = press[5]
+    elif active & 0b10000:
+        ch6 = CH6_LEFT
+    else:
+        ch6 = idle[5]
+
+    return (
+        press[0] if active & 0b1 else idle[0],        # CH1
+        press[1] if active & 0b10 else idle[1],       # CH2
+        press[2] if ch3_high else idle[2],            # CH3 (0+3 pulse)
+        press[3] if active & 0b1000 else idle[3],     # CH4 (armed 0->4)
+        idle[4],                                      # CH5 unused
+        ch6,                                          # CH6
+        press[6] if active & 0b1000000 else idle[6],  # CH7
+        idle[7],                                      # CH8
+    )
+
+
+def port_identity(port):
+    """
+    "VID:PID:serial" of the USB device currently behind port, or None when the
+    port is gone or reports no USB IDs. Paths get reassigned on replug, so the
+    cached path is only trusted while this still matches.
+    """
+    for p in list_ports.grep("^" + re.escape(port) + "$"):
+        if p.device == port and p.vid is not None and p.pid is not None:
+            return f"{p.vid:04X}:{p.pid:04X}:{p.serial_number or ''}"
+    return None
+
+
+def load_cached_port():
+    """Return (path, identity) of the last successfully opened port, or (None, None)."""
+    try:
+        with open(PORT_CACHE_FILE) as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return None, None
+    if len(lines) != 2:
+        return None, None  # empty, or written before identities were cached
+    return lines[0], lines[1]
+
+
+def save_cached_port(port):
+    ident = port_identity(port)
+    if ident is None:
+        return  # nothing to verify it by next time; let the scan find it
+    try:
+        with open(PORT_CACHE_FILE, "w") as f:
+            f.write(f"{port}\n{ident}\n")
+    except OSError as e:
+        print(f"⚠️ Could not cache serial port: {e}")
+
+
+def prepare_port(ser):
+    """
+    Enlarge the driver queues (Windows only), drop stale bytes left over from
+    the board's reset, and bound how long a wedged adapter can block a write.
+    """
+    try:
+        ser.set_buffer_size(rx_size=65536, tx_size=65536)
+    except AttributeError:
+        pass  # POSIX ports have no driver queue setting
+    time.sleep(0.05)
+    ser.reset_input_buffer()
+    ser.reset_output_buffer()
+    ser.write_timeout = 0.05
+
+
+def enable_low_latency(ser):
+    """
+    Linux only: set ASYNC_LOW_LATENCY on the tty so the USB-serial driver
+    flushes each write right away instead of waiting on its latency timer (~16 ms).
+    Silently does nothing on other platforms or drivers that refuse it.
+    """
+    if not sys.platform.startswith("linux"):
+        return False
+
+    # pyserial >= 3.5 exposes this directly on POSIX ports
+    try:
+        ser.set_low_latency_mode(True)
+        return True
+    except (AttributeError, ValueError, OSError):
+        pass
+
+    try:
+        import fcntl
+        import struct
+
+        TIOCGSERIAL = 0x541E
+        TIOCSSERIAL = 0x541F
+        ASYNC_LOW_LATENCY = 0x2000
+        FLAGS_OFFSET = 16  # struct serial_struct: type, line, port, irq, flags, ...
+
+        buf = bytearray(0x48)
+        fcntl.ioctl(ser.fileno(), TIOCGSERIAL, buf)
+        flags = struct.unpack_from("i", buf, FLAGS_OFFSET)[0]
+        if not flags & ASYNC_LOW_LATENCY:
+            struct.pack_into("i", buf, FLAGS_OFFSET, flags | ASYNC_LOW_LATENCY)
+            fcntl.ioctl(ser.fileno(), TIOCSSERIAL, buf)
+        return True
+    except Exception:
+        return False
+
+
+class GesturePPMApp(BaseGestureWindow):
     def __init__(self):
         # ----- Serial -----
-        port = find_arduino_port()
+        # Warm path: reopen the last known port if the same device is still behind it
+        self.ser = None
+        port, ident = load_cached_port()
+        if port is not None and port_identity(port) != ident:
+            print(f"Cached serial port {port} no longer matches the saved device; scanning.")
+            port = None
         if port is not None:
             try:
                 self.ser = serial.Serial(port, BAUD_RATE, timeout=0.1)
-                print(f"✅ Connected to {port}")
-            except Exception as e:
+            except Exception:
+                print(f"Cached serial port {port} unavailable; scanning.")
+
+        if self.ser is None:
+            port = find_arduino_port()
+            if port is not None:
+                try:
+                    self.ser = serial.Serial(port, BAUD_RATE, timeout=0.1)
+                except Exception as e:
+                    print(f"⚠️ Failed to open serial port {port}: {e}")
+
+        if self.ser is not None:
+            try:
+                prepare_port(self.ser)
+            except (serial.SerialException, OSError) as e:
+                # Opened but unusable (adapter vanished mid-setup): run without serial
+                print(f"⚠️ Failed to set up serial port {port}: {e}")
+                try:
+                    self.ser.close()
+                except Exception:
+                    pass
                 self.ser = None
-                print(f"⚠️ Failed to open serial port {port}: {e}")
-        else:
-            self.ser = None
+
+        if self.ser is not None:
+            print(f"✅ Connected to {port}")
+            save_cached_port(port)
+            if enable_low_latency(self.ser):
+                print("Serial low-latency mode enabled.")
+        self._ser_ok = self.ser is not None  # cleared once in on_close
+        self._write = self.ser.write if self._ser_ok else None
 
         # ----- Channel state -----
-        self.channels = [1500] * 8          # 8 channel initial values
-        self.channels[5] = 1441             # CH6 idle default
-        self.pressed = [False] * 8          # index 0–6 correspond to keys 1–7
-        self.last_sent = self.channels.copy()
-        self.lock = threading.Lock()
+        # 8 channel values (µs), CH6 idle at 1441, CH5/CH8 stay 1500.
+        # Immutable: republished whole on change so readers never see a half-updated frame.
+        self.channels = (1500, 1500, 1500, 1500, 1500, 1441, 1500, 1500)
+        self.pressed_mask = 0               # bit i set while key i+1 is held (keys 1–7)
+        self._fmt = b"%d,%d,%d,%d,%d,%d,%d,%d\n"  # one serial line, formatted in C
+        # channels tuple -> (serial line, log text); key states only ever produce a handful of frames
+        self._lines = {}
         self.running = True
+        self._pulse_job = None              # pending root.after id while CH3 pulses
+        self._flush_pending = False         # an after_idle flush is already queued
 
         # CH3 pulsing (0 -> 3): toggle between 1500 and 2180
         self.ch3_pulse_state = False        # False = 1500, True = 2180
-        self.ch3_last_toggle = time.time()
-        self.ch3_pulse_interval = 0.1       # seconds between toggles (~5 Hz)
+        self.ch3_last_toggle = time.monotonic_ns()
+        self.ch3_pulse_interval_ns = 100_000_000  # between toggles (~5 Hz)
 
         # Sequence activation: tap 0, then 3/4/5/6
         self.armed_special = False          # whether 0 has been tapped
-        self.allowed_special = [False] * 8  # whether specific key (3/4/5/6) is authorized this round
+        self.allowed_mask = 0               # bit i set if key i+1 (3/4/5/6) is authorized this round
 
         # Press target values (index = channel - 1)
-        self.press_values = [2000] * 8
-        self.press_values[3] = 1700  # CH4: vibration (armed 0->4)
-        self.press_values[4] = 1500  # CH5 unused (always idle)
-        self.press_values[5] = 1500  # CH6 handled separately by keys 5/6
+        self.press_target = (
+            2000, 2000,
+            2180,        # CH3: pulse high (armed 0->3)
+            1700,        # CH4: vibration (armed 0->4)
+            1500,        # CH5 unused (always idle)
+            2180,        # CH6: drop right (armed 0->6); 0->5 is CH6_LEFT
+            2000, 1500,
+        )
+        # Idle target values; must match the initial self.channels
+        self.idle_target = (1500, 1500, 1500, 1500, 1500, 1441, 1500, 1500)
 
         # Display text mapping
         self.feature_names = {
@@ -89,17 +274,14 @@ class GesturePPMApp:
         # Global keyboard hook support
         self.use_global_keyboard = keyboard is not None
         self.kb_hook = None
+        # Hook-thread key events, handed to the Tk thread so only it touches key/channel state
+        self._kb_events = queue.SimpleQueue()
 
         # ----- Tk UI -----
-        self.root = tk.Tk()
-        self.root.title("Gesture Console")
+        super().__init__("Gesture Console")
 
         # Start in a windowed mode; still resizable by the user.
         self.root.geometry("1200x800")
-        self.root.configure(bg="#050508")
-
-        self.canvas = Canvas(self.root, bg="#050508", highlightthickness=0)
-        self.canvas.pack(fill="both", expand=True)
 
         # UI element handles
         self.exit_rect = None
@@ -108,19 +290,30 @@ class GesturePPMApp:
         self.main_text = None
         self.subtitle_text = None
         self.helper_text = None
+        self.top_rect = None
+        self.bar_labels = []
+        self.bar_mask = None
+        self.bar_line = None
+        self._main_text_cur = "Waiting"
+        self._subtitle_cur = "Press 1-7  ·  0 then 3/4/5/6 for actions"
 
         # Bar chart info
         self.bar_rects = []
+        self.last_y1 = [None] * 8           # last drawn top edge (px) per bar
+        self.last_bar_values = None         # channels tuple the bars currently show
         self.bar_base_y = 0
         self.bar_max_height = 160
         self.min_us = 500
         self.max_us = 2500
+        self.bars_dirty = False             # set by _recompute_targets when channels move
+        self._bars_job = None               # pending root.after id for the next redraw
 
         self.build_ui()
 
         # Key listeners (global if available, else Tk focus-based)
         if self.use_global_keyboard:
             self.kb_hook = keyboard.hook(self.on_global_event)
+            self.root.after(KB_POLL_IDLE_MS, self._pump_kb)
             print("Using global keyboard hooks via 'keyboard' library.")
         else:
             self.root.bind("<KeyPress>", self.on_key_press)
@@ -128,21 +321,6 @@ class GesturePPMApp:
             self.root.focus_force()
             print("Global keyboard hook not available; falling back to focused window keys.")
 
-        # Mouse for close button
-        self.canvas.bind("<Button-1>", self.on_click)
-
-        # Resize handler
-        self.root.bind("<Configure>", self.on_resize)
-
-        # Graceful close
-        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
-
-        # Start background thread for PPM updates
-        threading.Thread(target=self.updater_loop, daemon=True).start()
-
-        # Start bar animation
-        self.update_bars()
-
         self.root.mainloop()
 
     # =================== UI =================== #
@@ -155,23 +333,14 @@ class GesturePPMApp:
             h = self.root.winfo_screenheight()
         return w, h
 
-    def build_ui(self):
-        w, h = self.get_size()
-        self.canvas.delete("all")
-        self.bar_rects = []
+    def create_items(self):
+        """Create every canvas item once, unpositioned; build_ui lays them out."""
+        c = self.canvas
 
         # ---- Top bar ----
-        top_height = 56
-        padding_x = 24
-
-        self.canvas.create_rectangle(
-            0, 0, w, top_height,
-            fill="#090A10", outline=""
-        )
-
-        self.title_text = self.canvas.create_text(
-            padding_x,
-            top_height / 2,
+        self.top_rect = c.create_rectangle(0, 0, 0, 0, fill="#090A10", outline="")
+        self.title_text = c.create_text(
+            0, 0,
             anchor="w",
             text="Gesture Console",
             fill="#F5F5F7",
@@ -179,49 +348,100 @@ class GesturePPMApp:
         )
 
         # Exit pill
-        btn_w = 72
-        btn_h = 28
-        bx2 = w - padding_x
-        bx1 = bx2 - btn_w
-        by1 = (top_height - btn_h) / 2
-        by2 = by1 + btn_h
-
-        self.exit_rect = self.canvas.create_rectangle(
-            bx1, by1, bx2, by2,
+        self.exit_rect = c.create_rectangle(
+            0, 0, 0, 0,
             fill="#1F2027", outline="#3A3D45", width=1
         )
-        self.exit_text = self.canvas.create_text(
-            (bx1 + bx2) / 2,
-            (by1 + by2) / 2,
+        self.exit_text = c.create_text(
+            0, 0,
             text="Exit",
             fill="#E5E5EA",
             font=("Helvetica", 11)
         )
 
         # ---- Center content ----
-        center_y = h * 0.38
-
-        self.main_text = self.canvas.create_text(
-            w / 2,
-            center_y,
-            text="Waiting",
+        self.main_text = c.create_text(
+            0, 0,
+            text=self._main_text_cur,
             fill="#FFFFFF",
             font=("Helvetica", 42, "bold")
         )
-
-        self.subtitle_text = self.canvas.create_text(
-            w / 2,
-            center_y + 40,
-            text="Press 1-7  ·  0 then 3/4/5/6 for actions",
+        self.subtitle_text = c.create_text(
+            0, 0,
+            text=self._subtitle_cur,
             fill="#8E8E93",
             font=("Helvetica", 16)
         )
 
+        # ---- Bar chart for 8 channels ----
+        # Fixed full-height sprites: updates only slide them with canvas.move,
+        # the part below the baseline is hidden by the mask created after them
+        self.bar_rects = [
+            c.create_rectangle(0, 0, 0, 0, fill="#3D79FF", outline="")
+            for _ in range(8)
+        ]
+        self.bar_mask = c.create_rectangle(0, 0, 0, 0, fill="#050508", outline="")
+        self.bar_labels = [
+            c.create_text(
+                0, 0,
+                text=f"{i+1}",
+                fill="#6C6C70",
+                font=("Helvetica", 10)
+            )
+            for i in range(8)
+        ]
+        self.bar_line = c.create_line(0, 0, 0, 0, fill="#2C2C34", width=1)
+
+        # ---- Helper text ----
+        helper = (
+            "Tap 0 to arm 3/4/5/6   |   0 + 3: Pulse   |   0 + 4: Vibration   "
+            "|   0 + 5: Drop Left   |   0 + 6: Drop Right   |   Esc/Q: exit"
+        )
+        self.helper_text = c.create_text(
+            0, 0,
+            text=helper,
+            fill="#5C5C60",
+            font=("Helvetica", 11)
+        )
+
+    def build_ui(self):
+        """Lay out the (persistent) canvas items for the current window size."""
+        if not self.bar_rects:
+            self.create_items()
+        w, h = self.get_size()
+        coords = self.canvas.coords
+
+        # ---- Top bar ----
+        top_height = 56
+        padding_x = 24
+
+        coords(self.top_rect, 0, 0, w, top_height)
+        coords(self.title_text, padding_x, top_height / 2)
+
+        # Exit pill
+        btn_w = 72
+        btn_h = 28
+        bx2 = w - padding_x
+        bx1 = bx2 - btn_w
+        by1 = (top_height - btn_h) / 2
+        by2 = by1 + btn_h
+
+        self.exit_bbox = (bx1, by1, bx2, by2)
+        coords(self.exit_rect, bx1, by1, bx2, by2)
+        coords(self.exit_text, (bx1 + bx2) / 2, (by1 + by2) / 2)
+
+        # ---- Center content ----
+        center_y = h * 0.38
+
+        coords(self.main_text, w / 2, center_y)
+        coords(self.subtitle_text, w / 2, center_y + 40)
+
         # ---- Bar chart for 8 channels ----
         margin_bottom = 90
         chart_top = center_y + 90
         chart_height = min(self.bar_max_height, max(120, h - chart_top - margin_bottom))
         self.bar_max_height = chart_height
+        self._scale = self.bar_max_height / (self.max_us - self.min_us)  # px per µs
         self.bar_base_y = chart_top + chart_height
 
         bar_width = 26
@@ -229,83 +449,58 @@ class GesturePPMApp:
         total_width = 8 * bar_width + 7 * gap
         start_x = (w - total_width) / 2
 
-        self.bar_rects = []
         for i in range(8):
             x1 = start_x + i * (bar_width + gap)
             x2 = x1 + bar_width
             val = self.channels[i]
-            height = self.value_to_height(val)
-            y1_bar = self.bar_base_y - height
-            y2_bar = self.bar_base_y
+            y1_bar = int(self.bar_base_y - self.value_to_height(val))
+            y2_bar = y1_bar + self.bar_max_height
 
-            rect = self.canvas.create_rectangle(
-                x1, y1_bar, x2, y2_bar,
-                fill="#3D79FF", outline=""
-            )
-            self.bar_rects.append(rect)
+            coords(self.bar_rects[i], x1, y1_bar, x2, y2_bar)
+            self.last_y1[i] = y1_bar
+            coords(self.bar_labels[i], (x1 + x2) / 2, self.bar_base_y + 14)
 
-            label = f"{i+1}"
-            self.canvas.create_text(
-                (x1 + x2) / 2,
-                self.bar_base_y + 14,
-                text=label,
-                fill="#6C6C70",
-                font=("Helvetica", 10)
-            )
+        self.last_bar_values = self.channels
 
-        self.canvas.create_line(
+        coords(
+            self.bar_mask,
             start_x,
             self.bar_base_y,
             start_x + total_width,
+            self.bar_base_y + self.bar_max_height
+        )
+        coords(
+            self.bar_line,
+            start_x,
             self.bar_base_y,
-            fill="#2C2C34",
-            width=1
+            start_x + total_width,
+            self.bar_base_y
         )
 
         # ---- Helper text ----
-        helper = (
-            "Tap 0 to arm 3/4/5/6   |   0 + 3: Pulse   |   0 + 4: Vibration   "
-            "|   0 + 5: Drop Left   |   0 + 6: Drop Right   |   Esc/Q: exit"
-        )
-        self.helper_text = self.canvas.create_text(
-            w / 2,
-            h - 40,
-            text=helper,
-            fill="#5C5C60",
-            font=("Helvetica", 11)
-        )
+        coords(self.helper_text, w / 2, h - 40)
 
     def value_to_height(self, val):
         val_clamped = max(self.min_us, min(self.max_us, val))
-        ratio = (val_clamped - self.min_us) / (self.max_us - self.min_us)
-        return ratio * self.bar_max_height
+        return (val_clamped - self.min_us) * self._scale
 
     # =================== EVENTS =================== #
 
-    def on_resize(self, event):
-        if event.widget == self.root:
-            self.build_ui()
-
-    def on_click(self, event):
-        x, y = event.x, event.y
-        if self.exit_rect and self.is_inside(x, y, self.exit_rect):
-            self.on_close()
-
     def on_close(self):
         self.running = False
-        time.sleep(0.05)
         if self.use_global_keyboard:
             try:
                 if self.kb_hook:
                     keyboard.unhook(self.kb_hook)
             except Exception:
                 pass
+        self._ser_ok = False
         if self.ser is not None:
             try:
                 self.ser.close()
             except:
                 pass
-        self.root.destroy()
+        super().on_close()
 
     def play_arm_sound(self):
         """Simple sound cue when 0 is tapped to arm."""
@@ -326,52 +521,51 @@ class GesturePPMApp:
 
         # Tap 0 -> arm actions (3/4/5/6)
         if char_lower == "0":
-            with self.lock:
-                self.armed_special = True
+            self.armed_special = True
             self.play_arm_sound()
-            self.canvas.itemconfig(self.main_text, text="Armed")
-            self.canvas.itemconfig(
-                self.subtitle_text,
-                text="0 tapped · Choose 3/4/5/6"
+            self._set_text(self.main_text, "_main_text_cur", "Armed")
+            self._set_text(
+                self.subtitle_text, "_subtitle_cur",
+                "0 tapped · Choose 3/4/5/6"
             )
             print("Activation tapped: waiting for 3/4/5/6")
             return
 
         # Gesture keys 1–7
-        if char_lower in "1234567":
-            idx = int(char_lower) - 1
-            with self.lock:
-                # Ignore key auto-repeat: only handle first press
-                if self.pressed[idx]:
-                    return
-
-                self.pressed[idx] = True
-
-                # 3/4/5/6 need 0->key arming
-                if idx in (2, 3, 4, 5):
-                    if self.armed_special:
-                        # Authorized for this press; consume the arm
-                        self.allowed_special[idx] = True
-                        self.armed_special = False
-                    else:
-                        # Not armed: this press is NOT authorized
-                        self.allowed_special[idx] = False
+        idx = _KEY_IDX.get(char_lower)
+        if idx is not None:
+            bit = 1 << idx
+            # Ignore key auto-repeat: only handle first press
+            if self.pressed_mask & bit:
+                return
+
+            self.pressed_mask |= bit
+
+            # 3/4/5/6 need 0->key arming
+            if bit & SPECIAL_MASK:
+                if self.armed_special:
+                    # Authorized for this press; consume the arm
+                    self.allowed_mask |= bit
+                    self.armed_special = False
+                else:
+                    # Not armed: this press is NOT authorized
+                    self.allowed_mask &= ~bit
 
+            self._schedule_flush()
             self.show_gesture(char_lower)
 
     def handle_key_release(self, key_char: str):
         """Shared key-release handler for Tk events and global keyboard hook."""
         char_lower = (key_char or "").lower()
-        if char_lower in "1234567":
-            idx = int(char_lower) - 1
-            with self.lock:
-                self.pressed[idx] = False
-                if idx in (2, 3, 4, 5):
-                    # One-shot: releasing 3/4/5/6 ends this authorized gesture
-                    self.allowed_special[idx] = False
-
-                any_pressed = any(self.pressed)
-            if not any_pressed:
+        idx = _KEY_IDX.get(char_lower)
+        if idx is not None:
+            bit = 1 << idx
+            self.pressed_mask &= ~bit
+            # One-shot: releasing 3/4/5/6 ends this authorized gesture
+            self.allowed_mask &= ~bit
+
+            self._schedule_flush()
+            if not self.pressed_mask:
                 self.clear_gesture()
 
     def on_key_press(self, event):
@@ -381,24 +575,43 @@ class GesturePPMApp:
         self.handle_key_release(event.char)
 
     def on_global_event(self, event):
-        """Global keyboard event (from keyboard library). Handles press and release."""
-        name = getattr(event, "name", None)
-        etype = getattr(event, "event_type", "")
-        if not name or not etype:
-            return
-        key = name.lower()
-        if key.startswith("num "):  # handle numpad digits
-            key = key.split(" ", 1)[1]
-        if etype == "down":
-            if key in ("escape", "esc"):
-                self.handle_key_press("", "escape")
-            elif key == "q":
-                self.handle_key_press("q", "q")
-            elif key in "01234567":
-                self.handle_key_press(key, key)
-        elif etype == "up":
-            if key in "1234567":
-                self.handle_key_release(key)
+        """Global keyboard event (keyboard library's thread): only queue it, no Tk calls here."""
+        self._kb_events.put((getattr(event, "event_type", ""), getattr(event, "name", None)))
+
+    def _pump_kb(self):
+        """
+        Drain queued global key events on the Tk main thread. Handles press and release.
+        Re-polls every KB_POLL_ACTIVE_MS while events arrive or a key is held/armed,
+        otherwise backs off to KB_POLL_IDLE_MS.
+        """
+        get = self._kb_events.get_nowait
+        busy = False
+        while self.running:
+            try:
+                etype, name = get()
+            except queue.Empty:
+                break
+            busy = True
+            if not name or not etype:
+                continue
+            key = name.lower()
+            if key.startswith("num "):  # handle numpad digits
+                key = key.split(" ", 1)[1]
+            if etype == "down":
+                if key in ("escape", "esc"):
+                    self.handle_key_press("", "escape")
+                elif key == "q":
+                    self.handle_key_press("q", "q")
+                elif key == "0" or key in _KEY_IDX:
+                    self.handle_key_press(key, key)
+            elif etype == "up":
+                if key in _KEY_IDX:
+                    self.handle_key_release(key)
+        if self.running:
+            if busy or self.pressed_mask or self.armed_special:
+                self.root.after(KB_POLL_ACTIVE_MS, self._pump_kb)
+            else:
+                self.root.after(KB_POLL_IDLE_MS, self._pump_kb)
 
     # =================== UI UPDATES =================== #
 
@@ -407,7 +620,7 @@ class GesturePPMApp:
         UI display:
         - 3/4/5/6 require 0 + key arming; show hint if not armed
         """
-        if not key_char or key_char not in "1234567":
+        if key_char not in _KEY_IDX:
             return
 
         num = int(key_char)
@@ -416,16 +629,14 @@ class GesturePPMApp:
         if feature:
             main_text = feature
             idx = num - 1
-            with self.lock:
-                allowed = self.allowed_special[idx]
+            allowed = bool(self.allowed_mask & (1 << idx))
             if allowed:
                 subtitle = f"Gesture {num} · {feature}"
             else:
                 subtitle = f"Gesture {num} · Need 0 + {num} to execute"
         elif num == 3:
             main_text = "Gesture 3"
-            with self.lock:
-                allowed = self.allowed_special[2]
+            allowed = bool(self.allowed_mask & 0b100)
             if allowed:
                 subtitle = "Gesture 3 · Pulse active"
             else:
@@ -434,128 +645,111 @@ class GesturePPMApp:
             main_text = f"Gesture {num}"
             subtitle = "Detected gesture"
 
-        self.canvas.itemconfig(self.main_text, text=main_text)
-        self.canvas.itemconfig(self.subtitle_text, text=subtitle)
+        self._set_text(self.main_text, "_main_text_cur", main_text)
+        self._set_text(self.subtitle_text, "_subtitle_cur", subtitle)
         print(f"Gesture detected: {subtitle}")
 
     def clear_gesture(self):
-        self.canvas.itemconfig(self.main_text, text="Waiting")
-        self.canvas.itemconfig(
-            self.subtitle_text,
-            text="Press 1-7  ·  0 then 3/4/5/6 for actions"
+        self._set_text(self.main_text, "_main_text_cur", "Waiting")
+        self._set_text(
+            self.subtitle_text, "_subtitle_cur",
+            "Press 1-7  ·  0 then 3/4/5/6 for actions"
         )
 
+    def request_bars(self):
+        """Schedule one redraw within a frame (~16 ms); no timer runs while idle."""
+        if self._bars_job is None and self.running:
+            self._bars_job = self.root.after(16, self.update_bars)
+
     def update_bars(self):
-        """Periodic update from channels[] to 8 bar heights."""
-        if not self.bar_rects:
-            self.root.after(50, self.update_bars)
+        """Apply the latest channel snapshot to the 8 bar heights."""
+        self._bars_job = None
+        if not self.bar_rects or not self.bars_dirty:
             return
 
-        with self.lock:
-            values = self.channels.copy()
+        values = self.channels  # one atomic load; never a half-updated frame
+        self.bars_dirty = False
+        # e.g. CH3 pulsed on and back off between two frames
+        if values == self.last_bar_values:
+            return
+        self.last_bar_values = values
 
+        # All 8 tops in one pass, with the scale precomputed in build_ui
+        lo, hi, scale, base_y = self.min_us, self.max_us, self._scale, self.bar_base_y
+        tops = [int(base_y - (min(hi, max(lo, v)) - lo) * scale) for v in values]
+
+        move = self.canvas.move
+        last_y1 = self.last_y1
         for i, rect in enumerate(self.bar_rects):
-            val = values[i]
-            height = self.value_to_height(val)
-            x1, _, x2, _ = self.canvas.coords(rect)
-            y1 = self.bar_base_y - height
-            y2 = self.bar_base_y
-            self.canvas.coords(rect, x1, y1, x2, y2)
-
-        self.root.after(50, self.update_bars)
-
-    # =================== PPM / SERIAL BACKGROUND =================== #
-
-    def send_if_changed(self):
-        with self.lock:
-            if self.channels != self.last_sent:
-                line = ",".join(str(v) for v in self.channels)
-                if self.ser is not None and self.ser.is_open:
-                    try:
-                        self.ser.write((line + "\n").encode())
-                    except Exception as e:
-                        print(f"⚠️ Serial write error: {e}")
-                self.last_sent = self.channels.copy()
-                print(f"Sent: {line}")
-
-    def updater_loop(self):
+            # Zero delta covers sub-pixel jitter: nothing visible to redraw
+            dy = tops[i] - last_y1[i]
+            if dy:
+                move(rect, 0, dy)
+                last_y1[i] = tops[i]
+
+    # =================== PPM / SERIAL =================== #
+
+    def _send_snapshot(self, snap):
+        """Write one channel frame; callers only pass frames that changed."""
+        entry = self._lines.get(snap)
+        if entry is None:
+            line = self._fmt % snap
+            entry = self._lines[snap] = (line, f"Sent: {line.decode().rstrip()}")
+        line, log = entry
+        if self._ser_ok:
+            try:
+                self._write(line)
+            except Exception as e:
+                print(f"⚠️ Serial write error: {e}")
+        print(log)
+
+    def _recompute_targets(self):
         """
-        Background thread:
-        - CH1,2,7: press -> press_values[i] (2000), else 1500
+        Map key state to channel targets and send on change. Runs on key edges,
+        plus a timer at each CH3 toggle while 0+3 is held:
+        - CH1,2,7: press -> press_target[i] (2000), else idle_target[i] (1500)
         - CH3: requires arm; 0+3 pulses between 1500 and 2180, otherwise idle
         - CH4: requires arm; armed+pressed -> 1700, else 1500
         - CH6: 0+5 = 735, 0+6 = 2180, else 1441 (CH5 idle)
         - CH8: always 1500
         """
-        CH6_IDLE = 1441
-        CH6_LEFT = 735    # 0 -> 5
-        CH6_RIGHT = 2180  # 0 -> 6
-
-        while self.running:
-            changed = False
-            with self.lock:
-                # Standard channels (1,2,3,4,7)
-                for i in (0, 1, 2, 3, 6):
-                    if i == 2:
-                        # CH3: special pulsing when 0->3
-                        if self.pressed[2] and self.allowed_special[2]:
-                            now = time.time()
-                            if now - self.ch3_last_toggle >= self.ch3_pulse_interval:
-                                self.ch3_pulse_state = not self.ch3_pulse_state
-                                self.ch3_last_toggle = now
-                            target = 2180 if self.ch3_pulse_state else 1500
-                        else:
-                            self.ch3_pulse_state = False
-                            target = 1500
-
-                    elif i == 3:
-                        # CH4: requires arm (0 -> 4)
-                        active = self.pressed[3] and self.allowed_special[3]
-                        target = self.press_values[3] if active else 1500
-
-                    else:
-                        # CH1, CH2, CH7: simple press / idle
-                        active = self.pressed[i]
-                        target = self.press_values[i] if active else 1500
-
-                    if self.channels[i] != target:
-                        self.channels[i] = target
-                        changed = True
-
-                # CH5 unused, hold at 1500
-                if self.channels[4] != 1500:
-                    self.channels[4] = 1500
-                    changed = True
-
-                # CH6 driven by keys 5/6 (both require arm)
-                active_5 = self.pressed[4] and self.allowed_special[4]
-                active_6 = self.pressed[5] and self.allowed_special[5]
-                if active_6:
-                    target_ch6 = CH6_RIGHT
-                elif active_5:
-                    target_ch6 = CH6_LEFT
-                else:
-                    target_ch6 = CH6_IDLE
-
-                if self.channels[5] != target_ch6:
-                    self.channels[5] = target_ch6
-                    changed = True
-
-                # CH8 stays 1500
-                if self.channels[7] != 1500:
-                    self.channels[7] = 1500
-                    changed = True
-
-            if changed:
-                self.send_if_changed()
-
-            time.sleep(0.02)  # ~50Hz
-
-    # =================== UTIL =================== #
-
-    def is_inside(self, x, y, shape_id):
-        x1, y1, x2, y2 = self.canvas.coords(shape_id)
-        return x1 <= x <= x2 and y1 <= y <= y2
+        active = self.pressed_mask & (~SPECIAL_MASK | self.allowed_mask)
+
+        # CH3: special pulsing when 0->3
+        if active & 0b100:
+            now = time.monotonic_ns()
+            if now - self.ch3_last_toggle >= self.ch3_pulse_interval_ns:
+                self.ch3_pulse_state = not self.ch3_pulse_state
+                self.ch3_last_toggle = now
+            if self._pulse_job is None and self.running:
+                # Sleep straight to the next toggle instead of polling
+                wait_ns = self.ch3_last_toggle + self.ch3_pulse_interval_ns - now
+                self._pulse_job = self.root.after(max(1, wait_ns // 1_000_000), self._pulse_tick)
+        else:
+            self.ch3_pulse_state = False
+
+        snap = compute_targets(active, self.ch3_pulse_state, self.press_target, self.idle_target)
+
+        # Tuple compare runs in C; nothing to copy since channels is immutable
+        if snap != self.channels:
+            self.channels = snap
+            self.bars_dirty = True
+            self.request_bars()
+            self._send_snapshot(snap)
+
+    def _schedule_flush(self):
+        """Merge all key edges from one Tk event-loop pass into a single recompute/write."""
+        if not self._flush_pending:
+            self._flush_pending = True
+            self.root.after_idle(self._flush_serial_once)
+
+    def _flush_serial_once(self):
+        self._flush_pending = False
+        self._recompute_targets()
+
+    def _pulse_tick(self):
+        self._pulse_job = None
+        self._recompute_targets()
 
 
 if __name__ == "__main__":
@@ -1,17 +1,15 @@
-import tkinter as tk
-from tkinter import Canvas
+from gesture_window import BaseGestureWindow
 
+# Gesture key -> index
+_KEY_IDX = {c: i for i, c in enumerate("1234567")}
 
-class GestureUI:
-    def __init__(self):
-        self.root = tk.Tk()
-        self.root.title("Gesture Detection UI")
 
-        self.root.attributes("-fullscreen", True)
-        self.root.configure(bg="black")
+class GestureUI(BaseGestureWindow):
+    def __init__(self):
+        super().__init__("Gesture Detection UI", root_bg="black", fullscreen=True)
 
-        self.canvas = Canvas(self.root, bg="#050508", highlightthickness=0)
-        self.canvas.pack(fill="both", expand=True)
+        self._number_cur = "–"
+        self._subtitle_cur = "Waiting for gesture (1–7)"
 
         self.build_ui()
 
@@ -20,12 +18,6 @@ class GestureUI:
         self.root.bind("<KeyRelease>", self.on_key_release)
         self.root.focus_force()
 
-        # Only mouse for close button
-        self.canvas.bind("<Button-1>", self.on_click)
-
-        # Keep layout centered
-        self.root.bind("<Configure>", self.on_resize)
-
         self.root.mainloop()
 
     # ---------------- UI ---------------- #
@@ -43,6 +35,7 @@ class GestureUI:
         y1 = padding
         y2 = y1 + btn_size
 
+        self.exit_bbox = (x1, y1, x2, y2)
         self.exit_rect = self.canvas.create_oval(
             x1, y1, x2, y2,
             fill="#22252A", outline="#555A60", width=1.5
@@ -72,7 +65,7 @@ class GestureUI:
         self.number_text = self.canvas.create_text(
             w / 2,
             h / 2 - 20,
-            text="–",
+            text=self._number_cur,
             fill="#FFFFFF",
             font=("Helvetica", 80, "bold")
         )
@@ -81,7 +74,7 @@ class GestureUI:
         self.subtitle_text = self.canvas.create_text(
             w / 2,
             h / 2 + 40,
-            text="Waiting for gesture (1–7)",
+            text=self._subtitle_cur,
             fill="#8E8E93",
             font=("Helvetica", 18)
         )
@@ -97,50 +90,35 @@ class GestureUI:
 
     # ---------------- EVENTS ---------------- #
 
-    def on_resize(self, event):
-        if event.widget == self.root:
-            self.build_ui()
-
-    def on_click(self, event):
-        x, y = event.x, event.y
-        if self.is_inside(x, y, self.exit_rect):
-            self.root.destroy()
-
     # Key Press → show number
     def on_key_press(self, event):
         if event.keysym == "Escape" or event.char.lower() == "q":
-            self.root.destroy()
+            self.on_close()
             return
 
-        if event.char in "1234567":
+        if event.char in _KEY_IDX:
             self.show_number(event.char)
 
     # Key Release → hide number
     def on_key_release(self, event):
-        if event.char in "1234567":
+        if event.char in _KEY_IDX:
             self.clear_number()
 
     # ---------------- UI UPDATES ---------------- #
 
     def show_number(self, number):
-        self.canvas.itemconfig(self.number_text, text=str(number))
-        self.canvas.itemconfig(
-            self.subtitle_text, text=f"Detected gesture ID: {number}"
+        self._set_text(self.number_text, "_number_cur", str(number))
+        self._set_text(
+            self.subtitle_text, "_subtitle_cur", f"Detected gesture ID: {number}"
         )
         print(f"Gesture detected: {number}")
 
     def clear_number(self):
-        self.canvas.itemconfig(self.number_text, text="–")
-        self.canvas.itemconfig(
-            self.subtitle_text, text="Waiting for gesture (1–7)"
+        self._set_text(self.number_text, "_number_cur", "–")
+        self._set_text(
+            self.subtitle_text, "_subtitle_cur", "Waiting for gesture (1–7)"
         )
 
-    # ---------------- UTIL ---------------- #
-
-    def is_inside(self, x, y, shape_id):
-        x1, y1, x2, y2 = self.canvas.coords(shape_id)
-        return x1 <= x <= x2 and y1 <= y <= y2
-
 
 if __name__ == "__main__":
     GestureUI()
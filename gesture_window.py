@@ -0,0 +1,72 @@
+import tkinter as tk
+from tkinter import Canvas
+
+
+class BaseGestureWindow:
+    """
+    Shared Tk window for the gesture UIs: root + full-window canvas, exit-button
+    hit testing, debounced resize and cached text updates.
+    Subclasses implement build_ui() and set self.exit_bbox while laying out.
+    """
+
+    def __init__(self, title, root_bg="#050508", fullscreen=False):
+        self.root = tk.Tk()
+        self.root.title(title)
+
+        if fullscreen:
+            self.root.attributes("-fullscreen", True)
+        self.root.configure(bg=root_bg)
+
+        self.canvas = Canvas(self.root, bg="#050508", highlightthickness=0)
+        self.canvas.pack(fill="both", expand=True)
+
+        self.exit_bbox = None               # cached (x1, y1, x2, y2) of the exit button
+        self._resize_job = None             # pending debounced build_ui after a resize
+
+        # Mouse for close button
+        self.canvas.bind("<Button-1>", self.on_click)
+
+        # Resize handler
+        self.root.bind("<Configure>", self.on_resize)
+
+        # Graceful close
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    # ---------------- EVENTS ---------------- #
+
+    def on_resize(self, event):
+        # Tk fires <Configure> continuously while dragging; rebuild once it settles
+        if event.widget != self.root:
+            return
+        if self._resize_job:
+            self.root.after_cancel(self._resize_job)
+        self._resize_job = self.root.after(100, self._do_resize)
+
+    def _do_resize(self):
+        self._resize_job = None
+        self.build_ui()
+
+    def on_click(self, event):
+        x, y = event.x, event.y
+        if self.exit_bbox and self.is_inside(x, y, self.exit_bbox):
+            self.on_close()
+
+    def on_close(self):
+        self.root.destroy()
+
+    # ---------------- UTIL ---------------- #
+
+    def _set_text(self, item, attr, new):
+        """
+        itemconfig(text=new) unless the cached text in attr already matches.
+        Subclasses keep the text currently shown in attr, so unchanged updates
+        skip the Tk round-trip.
+        """
+        if getattr(self, attr) == new:
+            return
+        self.canvas.itemconfig(item, text=new)
+        setattr(self, attr, new)
+
+    def is_inside(self, x, y, bbox):
+        x1, y1, x2, y2 = bbox
+        return x1 <= x <= x2 and y1 <= y <= y2
@@ -25,10 +25,10 @@
     - threading：后台线程更新通道状态。
 """
 
+import array
 import serial
 from pynput import keyboard
 import matplotlib.pyplot as plt
-import matplotlib.animation as animation
 import time
 import threading
 
@@ -36,12 +36,19 @@ import threading
 SERIAL_PORT = "/dev/cu.usbmodem101"  # ✅ 修改为你电脑上实际的端口
 BAUD_RATE = 115200
 ser = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=0.1)
+try:
+    ser.set_buffer_size(rx_size=65536, tx_size=65536)  # 仅 Windows 有效，加大驱动缓冲区
+except AttributeError:
+    pass
+time.sleep(0.05)
+ser.reset_input_buffer()    # 丢弃 Arduino 复位时残留的数据
+ser.reset_output_buffer()
 print(f"✅ Connected to {SERIAL_PORT}")
 
 # ==== 全局状态 ====
-channels = [1500] * 8      # 8通道初始值（单位：μs）
-pressed = [False] * 8       # 每个通道的按键是否按下
-last_sent = channels.copy() # 记录上一次发送的值，避免重复发送
+channels = array.array('H', [1500] * 8)  # 8通道初始值（单位：μs），紧凑的 uint16 数组
+pressed_bits = 0            # 按键位图：第 i 位为 1 表示 CH(i+1) 的键被按下（仅键盘线程写入）
+last_sent = channels[:]     # 记录上一次发送的值，避免重复发送
 lock = threading.Lock()     # 多线程访问锁，防止读写冲突
 
 # -----------------------------------------------------
@@ -54,7 +61,7 @@ def send_if_changed():
             # 将通道值转换为逗号分隔字符串
             line = ",".join(str(v) for v in channels)
             ser.write((line + "\n").encode())  # 发送到 Arduino
-            last_sent = channels.copy()
+            last_sent = channels[:]
             # 控制台调试打印，可注释掉避免刷屏
             print(f"→ Sent: {line}")
 
@@ -64,16 +71,17 @@ def send_if_changed():
 def updater_loop():
     """
     持续运行（独立线程）：
-    - 根据 pressed[] 数组更新 channels[]。
+    - 根据 pressed_bits 位图更新 channels[]。
     - 按下的通道 → 2000，松开的通道 → 1500。
     - 若有变化则触发 send_if_changed()。
     """
     while True:
         changed = False
+        bits = pressed_bits     # 整数读取是原子的，无需加锁
         with lock:
             # 1~7 键映射到 CH1~CH7
             for i in range(7):
-                target = 2000 if pressed[i] else 1500
+                target = 2000 if bits >> i & 1 else 1500
                 if channels[i] != target:
                     channels[i] = target
                     changed = True
@@ -81,33 +89,40 @@ def updater_loop():
             send_if_changed()   # 仅当变化时才真正发串口
         time.sleep(0.02)        # 每20ms更新一次，等价于50Hz刷新率
 
+# -----------------------------------------------------
+# 按键查找表：KEY_IDX[ord(字符)] → 通道索引（1~7 键 → 0~6，255 表示不关心）
+# -----------------------------------------------------
+_table = bytearray([255]) * 256
+for _i, _c in enumerate(b"1234567"):
+    _table[_c] = _i
+KEY_IDX = bytes(_table)
+
+def key_index(key):
+    """返回按键对应的通道索引；非 1~7 键（含功能键、非 ASCII 字符）返回 255"""
+    k = getattr(key, "char", None)
+    if not k or len(k) != 1 or ord(k) > 255:
+        return 255
+    return KEY_IDX[ord(k)]
+
 # -----------------------------------------------------
 # 键盘事件：按下
 # -----------------------------------------------------
 def on_press(key):
-    """当键被按下时，将对应 pressed[idx] 置为 True"""
-    try:
-        k = key.char
-        if k in "1234567":         # 仅监听数字键 1~7
-            idx = int(k) - 1
-            if not pressed[idx]:   # 避免重复赋值
-                pressed[idx] = True
-    except:
-        pass
+    """当键被按下时，将 pressed_bits 的对应位置 1"""
+    global pressed_bits
+    idx = key_index(key)
+    if idx < 7:                 # 仅监听数字键 1~7
+        pressed_bits |= 1 << idx
 
 # -----------------------------------------------------
 # 键盘事件：松开
 # -----------------------------------------------------
 def on_release(key):
-    """当键松开时，将对应 pressed[idx] 置为 False"""
-    try:
-        k = key.char
-        if k in "1234567":
-            idx = int(k) - 13
-            if pressed[idx]:
-                pressed[idx] = False
-    except:
-        pass
+    """当键松开时，将 pressed_bits 的对应位清 0"""
+    global pressed_bits
+    idx = key_index(key)
+    if idx < 7:
+        pressed_bits &= ~(1 << idx)
 
 # -----------------------------------------------------
 # 图表初始化
@@ -120,15 +135,23 @@ ax.set_xlabel("Channel")
 ax.set_ylabel("Value (µs)")
 ax.set_title("Real-Time Channel Output") # 标题（避免 emoji 警告）
 
+last_drawn = channels[:]                 # 图上当前显示的值
+
 # -----------------------------------------------------
-# 动画函数：每帧更新柱状高度
+# 定时回调：仅在通道值变化时更新柱状高度并重绘
 # -----------------------------------------------------
-def animate(_frame):
-    """Matplotlib 动画回调：每100ms刷新一次柱状图"""
+def animate():
+    """每100ms检查一次；无变化时直接返回，不触发任何重绘"""
+    global last_drawn
     with lock:
-        for i, b in enumerate(bars):
-            b.set_height(channels[i])
-    return bars
+        snap = channels[:]
+    if snap == last_drawn:
+        return
+    for i, b in enumerate(bars):
+        if snap[i] != last_drawn[i]:
+            b.set_height(snap[i])
+    last_drawn = snap
+    fig.canvas.draw_idle()
 
 # -----------------------------------------------------
 # 启动后台线程与键盘监听器
@@ -137,12 +160,9 @@ threading.Thread(target=updater_loop, daemon=True).start()   # 通道更新线
 keyboard.Listener(on_press=on_press, on_release=on_release).start()  # 键盘监听
 
 # -----------------------------------------------------
-# 启动实时图表动画
+# 启动实时图表刷新
 # -----------------------------------------------------
-ani = animation.FuncAnimation(
-    fig,
-    animate,
-    interval=100,           # 每100ms刷新图表
-    cache_frame_data=False  # 避免 Matplotlib 缓存警告
-)
+timer = fig.canvas.new_timer(interval=100)  # 每100ms检查一次
+timer.add_callback(animate)
+timer.start()
 plt.show()
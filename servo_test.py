@@ -8,12 +8,16 @@
         1 → CH6 =  500 µs
         2 → CH6 = 2500 µs
         3 → CH6 = 2212 µs
-    - 松开按键后，CH6 恢复到 1500 µs（中位）。
+    - 同时按住多个键时，以编号最大的键为准；全部松开后，CH6 恢复到 1500 µs（中位）。
     - 其他通道始终维持 1500 µs。
-    - 通道状态变化后，通过串口发送一行形如：
-        1500,1500,1500,1500,1500,500,1500,1500\n
-      给 Arduino（使用 Pro Micro PPM 代码）。
+    - 启动时先发送一行完整 8 通道的中位帧（全部 1500），覆盖其他程序留下的值。
+    - 之后通道状态变化时，通过串口发送一行形如：
+        1500,1500,1500,1500,1500,500\n
+      给 Arduino（使用 Pro Micro PPM 代码）。Arduino 端缺省的通道保持上次值，
+      CH7/CH8 已由启动帧置为 1500，因此只发送 CH1..CH6，缩短每行字节数。
     - 同时用 Matplotlib 实时显示 8 通道的当前值（柱状图）。
+    - 键盘监听运行在独立子进程中，通过队列把 CH6 目标值传回主进程，
+      避免 Matplotlib 绘图占用 GIL 时拖慢按键响应。
     - 仅在通道值变化时才发送串口数据。
 
 ● 串口连接
@@ -24,19 +28,32 @@
 import serial
 from pynput import keyboard
 import matplotlib.pyplot as plt
-import matplotlib.animation as animation
 import threading
+import queue
+import time
+import multiprocessing as mp
 
 # ==== 串口设置 ====
 SERIAL_PORT = "/dev/cu.usbmodem101"  # ✅ 修改为你电脑上实际的端口
 BAUD_RATE = 115200
-ser = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=0.1)
-print(f"✅ Connected to {SERIAL_PORT}")
+
+def open_serial():
+    # 本程序只写不读：timeout=0 读取不等待；write_timeout=0.05 限制写入最多阻塞 50 ms，
+    # 超时抛出 SerialTimeoutException（write_timeout=0 不会抛异常，而是静默只写出部分字节）
+    s = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=0, write_timeout=0.05)
+    try:
+        s.set_buffer_size(rx_size=4096, tx_size=8192)  # 仅 Windows 有效，让驱动吸收突发写入
+    except AttributeError:
+        pass
+    print(f"✅ Connected to {SERIAL_PORT}")
+    return s
 
 # ==== 全局状态 ====
-channels = [1500] * 8      # 8 通道初始值（单位：µs）
-last_sent = channels.copy() # 记录上一次发送的值，避免重复发送
-lock = threading.Lock()     # 多线程访问锁，防止读写冲突
+channels = [1500] * 8      # 8 通道初始值（单位：µs），只有 CH6 会变化
+ch6_value = 1500            # CH6 当前值；只由键盘转发线程赋值，int 赋值是原子的，读者无需加锁
+last_ch6_sent = 1500        # 最近一次成功发送的 CH6 值；只由写线程修改
+pending = queue.Queue(maxsize=1)  # 待发送的 CH6 值，只保留最新一个
+DEBOUNCE_S = 0.003          # 收到新值后等待 3 ms，合并快速连按，只发最后一个值
 
 # 键到 CH6 脉宽的映射
 KEY_TO_US = {
@@ -45,95 +62,194 @@ KEY_TO_US = {
     "3": 2212,
 }
 
-# 当前激活的键（1/2/3），用于处理松开逻辑
-active_key = None
+# 启动帧：完整 8 通道中位值。Arduino 只覆盖收到的通道，先把 CH7/CH8 也置为 1500
+IDLE_FRAME = (",".join(str(v) for v in channels) + "\n").encode()
+
+# 预先生成每个 CH6 取值对应的整行数据（其余通道固定 1500），发送时只需查表
+# 只发到 CH6 为止：CH7/CH8 已由启动帧置为 1500，之后不再变化
+LINES = {
+    us: ",".join(str(v) for v in channels[:5] + [us])
+    for us in (1500, *KEY_TO_US.values())
+}
+PAYLOADS = {us: (line + "\n").encode() for us, line in LINES.items()}  # 串口字节
+SENT_LOGS = {us: f"→ Sent: {line}" for us, line in LINES.items()}       # 日志文本
+
+# 1/2/3 的按下状态，按 KEY_TO_US 的顺序索引（仅在键盘子进程中使用）
+KEY_IDX = {k: i for i, k in enumerate(KEY_TO_US)}
+KEY_US = tuple(KEY_TO_US.values())
+pressed = [False] * len(KEY_US)
+kbd_queue = None            # 键盘子进程 → 主进程的 CH6 目标值队列
 
 # -----------------------------------------------------
-# 函数：仅当通道变化时才发送一行新的串口数据
+# 串口写线程：取出最新的 CH6 值并发送（串口 I/O 不占用键盘回调线程）
 # -----------------------------------------------------
-def send_if_changed():
-    global last_sent
-    with lock:
-        if channels != last_sent:
-            line = ",".join(str(v) for v in channels)
-            ser.write((line + "\n").encode())
-            last_sent = channels.copy()
-            print(f"→ Sent: {line}")
+def serial_writer():
+    global last_ch6_sent
+    while True:
+        ch6 = pending.get()
+        time.sleep(DEBOUNCE_S)
+        try:
+            ch6 = pending.get_nowait()  # 等待期间有更新的值则取最新的
+        except queue.Empty:
+            pass
+        if ch6 == last_ch6_sent:  # 合并后可能回到已发送的值，无需重复发送
+            continue
+        # 整行一次写入；不调用 ser.flush()，交给系统驱动合并发送
+        try:
+            ser.write(PAYLOADS[ch6])
+        except serial.SerialTimeoutException:
+            ser.reset_output_buffer()   # 丢掉未发出的半行，避免与下一行拼接
+            print("⚠️ Serial write timed out, update dropped")
+            continue              # last_ch6_sent 不变，下一次变化仍会发送
+        last_ch6_sent = ch6
+        print(SENT_LOGS[ch6])
 
 # -----------------------------------------------------
-# 设置 CH6（索引 5）的值并尝试发送
+# 设置 CH6（索引 5）的值并交给写线程发送
 # -----------------------------------------------------
 def set_ch6(value):
-    with lock:
-        if channels[5] == value:
-            return
-        channels[5] = value
-    send_if_changed()
+    global ch6_value
+    if ch6_value == value:
+        return
+    ch6_value = value
+    # 丢弃尚未发送的旧值，只保留最新值（仅键盘转发线程写入队列，put 不会阻塞）
+    try:
+        pending.get_nowait()
+    except queue.Empty:
+        pass
+    pending.put_nowait(value)
+
+# -----------------------------------------------------
+# 根据当前按下的键计算 CH6：编号最大的按下键优先，都没按下时为 1500
+# -----------------------------------------------------
+def resolve_ch6():
+    for i in range(len(pressed) - 1, -1, -1):
+        if pressed[i]:
+            return KEY_US[i]
+    return 1500
 
 # -----------------------------------------------------
-# 键盘事件：按下
+# 键盘事件：按下（在键盘子进程中运行）
 # -----------------------------------------------------
 def on_press(key):
-    global active_key
     try:
-        k = key.char
+        i = KEY_IDX.get(key.char)
     except AttributeError:
         return
 
-    if k in KEY_TO_US:
-        # 记录当前激活键，并设定对应脉宽
-        active_key = k
-        set_ch6(KEY_TO_US[k])
+    # 非 1/2/3，或按住不放时系统重复触发的按下事件，直接忽略
+    if i is None or pressed[i]:
+        return
+
+    pressed[i] = True
+    kbd_queue.put(resolve_ch6())
 
 # -----------------------------------------------------
-# 键盘事件：松开
+# 键盘事件：松开（在键盘子进程中运行）
 # -----------------------------------------------------
 def on_release(key):
-    global active_key
     try:
-        k = key.char
+        i = KEY_IDX.get(key.char)
     except AttributeError:
         return
 
-    # 只有松开当前激活的键时，才恢复到 1500
-    if k == active_key:
-        active_key = None
-        set_ch6(1500)
+    if i is None or not pressed[i]:
+        return
+
+    pressed[i] = False
+    kbd_queue.put(resolve_ch6())
 
 # -----------------------------------------------------
-# 图表初始化
+# 键盘子进程入口：运行 pynput 监听，直到被主进程结束
 # -----------------------------------------------------
-fig, ax = plt.subplots()
-bars = ax.bar(range(1, 9), channels)     # 初始化8个柱子
-ax.set_ylim(400, 2600)                   # 为 500/1500/2212/2500 预留范围
-ax.set_xticks(range(1, 9))
-ax.set_xlabel("Channel")
-ax.set_ylabel("Value (µs)")
-ax.set_title("Real-Time Channel Output (CH6 controlled by 1/2/3)")
+def listen(q):
+    global kbd_queue
+    kbd_queue = q
+    with keyboard.Listener(on_press=on_press, on_release=on_release) as listener:
+        listener.join()
 
 # -----------------------------------------------------
-# 动画函数：每帧更新柱状高度
+# 键盘转发线程（主进程）：取出子进程传来的 CH6 目标值并设置
 # -----------------------------------------------------
-def animate(_frame):
-    with lock:
-        for i, b in enumerate(bars):
-            b.set_height(channels[i])
-    return bars
+def kbd_pump(q):
+    while True:
+        set_ch6(q.get())
 
 # -----------------------------------------------------
-# 启动键盘监听与实时图表动画
+# 图表初始化
 # -----------------------------------------------------
-listener = keyboard.Listener(on_press=on_press, on_release=on_release)
-listener.start()
+def setup_chart():
+    fig, ax = plt.subplots()
+    bars = ax.bar(range(1, 9), channels)     # 初始化8个柱子
+    ax.set_ylim(400, 2600)                   # 为 500/1500/2212/2500 预留范围
+    ax.set_xticks(range(1, 9))
+    ax.set_xlabel("Channel")
+    ax.set_ylabel("Value (µs)")
+    ax.set_title("Real-Time Channel Output (CH6 controlled by 1/2/3)")
+
+    # CH6 的柱子不画进背景，变化时只恢复背景并重画这一根柱子（blit）
+    bars[5].set_animated(True)
+    fig.canvas.mpl_connect("draw_event", on_draw)
+    return fig, ax, bars
+
+last_drawn_ch6 = ch6_value               # 图上当前显示的 CH6 值
+background = None                        # 不含 CH6 柱子的坐标轴背景缓存
 
-ani = animation.FuncAnimation(
-    fig,
-    animate,
-    interval=100,           # 每 100 ms 刷新图表
-    cache_frame_data=False
-)
+# -----------------------------------------------------
+# 完整重绘（首次显示、缩放窗口）后重新缓存背景
+# -----------------------------------------------------
+def on_draw(_event):
+    global background
+    background = fig.canvas.copy_from_bbox(ax.bbox)
+    ax.draw_artist(bars[5])
 
-plt.show()
+# -----------------------------------------------------
+# 刷新函数：只在 CH6 变化时更新柱子并 blit
+# -----------------------------------------------------
+def animate():
+    """每300ms检查一次；其余通道固定 1500，只有 CH6 的柱子可能需要更新"""
+    global last_drawn_ch6
+    v = ch6_value
+    if v == last_drawn_ch6:
+        return
+    set_ch6_bar(v)
+    last_drawn_ch6 = v
+    if background is None:               # 还没完成首次绘制
+        fig.canvas.draw_idle()
+        return
+    fig.canvas.restore_region(background)
+    ax.draw_artist(bars[5])
+    fig.canvas.blit(ax.bbox)
+
+# -----------------------------------------------------
+# 启动键盘子进程、串口写线程与实时图表
+# 子进程用 spawn 方式启动，并且在打开串口、创建任何线程之前启动：
+# 不会继承串口句柄，也不会从多线程进程中 fork。
+# spawn 会重新导入本文件，因此串口与图表只在主进程中创建。
+# -----------------------------------------------------
+if __name__ == "__main__":
+    ctx = mp.get_context("spawn")
+    q = ctx.Queue()
+    kbd_proc = ctx.Process(target=listen, args=(q,), daemon=True)
+    kbd_proc.start()
 
-# 程序结束时停止监听（窗口关掉后）
-listener.stop()
+    ser = open_serial()
+    try:
+        ser.write(IDLE_FRAME)   # 先发一帧完整中位，覆盖板子上其他程序留下的通道值
+        print(f"→ Sent: {IDLE_FRAME.decode().rstrip()}")
+    except serial.SerialTimeoutException:
+        ser.reset_output_buffer()   # 丢掉未发出的半行，避免与下一行拼接
+        print("⚠️ Serial write timed out, idle frame dropped (CH7/CH8 may keep old values)")
+    threading.Thread(target=serial_writer, daemon=True).start()
+    threading.Thread(target=kbd_pump, args=(q,), daemon=True).start()
+
+    fig, ax, bars = setup_chart()
+    set_ch6_bar = bars[5].set_height         # 预先绑定，animate 中只需一次调用
+    timer = fig.canvas.new_timer(interval=300)  # 每 300 ms 检查一次，减少主线程唤醒与 GIL 争用
+    timer.add_callback(animate)
+    timer.start()
+
+    plt.show()
+
+    # 程序结束时停止键盘子进程（窗口关掉后）
+    kbd_proc.terminate()